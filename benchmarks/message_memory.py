@@ -0,0 +1,103 @@
+"""Session-state memory per 100 sessions: dict messages vs. ChatTurn records.
+
+Run with: python benchmarks/message_memory.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import message_store
+from utils.message_store import ROLE_ASSISTANT, ROLE_USER, ChatTurn, spill_payload
+
+SESSIONS = 100
+TURNS_PER_SESSION = 20
+
+STRUCTURED_RESPONSE_KEYS = [
+    "quantitative_reasoning",
+    "qualitative_reasoning",
+    "short_quantitative_reasoning",
+    "short_qualitative_reasoning",
+    "quantitative_answer",
+    "qualitative_answer",
+]
+
+
+def make_payload(session: int, turn: int) -> dict:
+    payload = {key: f"{key} s{session} t{turn} " + "reasoning " * 60 for key in STRUCTURED_RESPONSE_KEYS}
+    payload["quantitative_answer"] = str(turn)
+    return payload
+
+
+def make_reply(payload: dict) -> str:
+    return (
+        f"**Order Logic:** {payload['short_qualitative_reasoning']}\n\n"
+        f"**Recommended Order:** {payload['qualitative_answer']}"
+    )
+
+
+def build_dict_sessions() -> list:
+    sessions = []
+    for s in range(SESSIONS):
+        messages = []
+        for t in range(TURNS_PER_SESSION):
+            payload = make_payload(s, t)
+            messages.append({"role": "user", "content": f"Week {t}, demand {t + 4}, inventory 12"})
+            messages.append({"role": "assistant", "content": make_reply(payload), "assistant_output": payload})
+        sessions.append(messages)
+    return sessions
+
+
+def build_turn_sessions() -> list:
+    sessions = []
+    for s in range(SESSIONS):
+        session_id = f"bench{s}"
+        messages = []
+        for t in range(TURNS_PER_SESSION):
+            payload = make_payload(s, t)
+            messages.append(ChatTurn(ROLE_USER, f"Week {t}, demand {t + 4}, inventory 12"))
+            payload_key = uuid.uuid4().hex
+            payload_blob = f"beergame_qualitative_structured_OPMGT_301_A_P{s}_Retailer_20260101_120000_T{2 * t + 1}.json"
+            messages.append(
+                ChatTurn(
+                    ROLE_ASSISTANT,
+                    make_reply(payload),
+                    payload_key,
+                    spill_payload(session_id, payload_key, payload),
+                    payload_blob,
+                )
+            )
+        sessions.append(messages)
+    return sessions
+
+
+def measure(builder) -> int:
+    tracemalloc.start()
+    sessions = builder()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current
+
+
+def main():
+    spill_dir = tempfile.mkdtemp(prefix="beergame_bench_")
+    message_store.PAYLOAD_SPILL_DIR = spill_dir
+    try:
+        dict_bytes = measure(build_dict_sessions)
+        turn_bytes = measure(build_turn_sessions)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    print(f"{SESSIONS} sessions x {TURNS_PER_SESSION} exchanges")
+    print(f"dict messages: {dict_bytes / 1024:10.1f} KiB")
+    print(f"ChatTurn:      {turn_bytes / 1024:10.1f} KiB")
+    print(f"reduction:     {100 * (1 - turn_bytes / dict_bytes):10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
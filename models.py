@@ -1,16 +1,19 @@
-from utils.prompt_utils import qualitative_beergame_prompt, quantitative_beergame_prompt
+from utils.prompt_utils import (
+    QUALITATIVE_SYSTEM_INSTRUCTION,
+    QUANTITATIVE_SYSTEM_INSTRUCTION,
+)
 
 
 MODEL_CONFIGS = {
     "BeerGameQualitative": {
         "name": "Beer Game qualitative coach",
-        "prompt": qualitative_beergame_prompt,
+        "system_instruction": QUALITATIVE_SYSTEM_INSTRUCTION,
         "uses_rag": False,
         "uses_classification": False,
     },
     "BeerGameQuantitative": {
         "name": "Beer Game quantitative coach",
-        "prompt": quantitative_beergame_prompt,
+        "system_instruction": QUANTITATIVE_SYSTEM_INSTRUCTION,
         "uses_rag": False,
         "uses_classification": False,
     },
@@ -4,6 +4,7 @@ import os
 import shutil
 import json
 import re
+import uuid
 from datetime import datetime
 from openai import OpenAI, BadRequestError
 
@@ -11,7 +12,18 @@ from google.cloud import storage
 from google.oauth2.service_account import Credentials
 
 from models import MODEL_CONFIGS
-from utils.prompt_utils import build_structured_output_instruction
+from utils.game_config import load_game_configs
+from utils.prompt_utils import build_mode_prompt, build_structured_output_instruction
+from utils.message_store import (
+    NO_PAYLOAD,
+    ROLE_ASSISTANT,
+    ROLE_USER,
+    ChatTurn,
+    clear_payloads,
+    iter_turn_records,
+    spill_payload,
+    sweep_stale_payloads,
+)
 from utils.utils import response_generator
 
 # ----------------------------
@@ -72,15 +84,28 @@ except Exception as exc:
     st.error(f"GCP setup failed: {exc}")
     st.stop()
 
+# ----------------------------
+# Game configuration (loaded and validated once per server process)
+# ----------------------------
+@st.cache_resource
+def get_game_configs() -> dict:
+    return load_game_configs(st.secrets.get("game_configs"))
+
+
+try:
+    GAME_CONFIGS = get_game_configs()
+except ValueError as exc:
+    st.error(f"Game configuration is invalid: {exc}")
+    st.stop()
+
 # ----------------------------
 # Constants
 # ----------------------------
-SECTION_OPTIONS = ["OPMGT 301 A", "OPMGT 301 B", "OPMGT 301 C"]
+SECTION_OPTIONS = list(GAME_CONFIGS)
 ROLE_PLACEHOLDER = "Select your role..."
 ROLE_OPTIONS = [ROLE_PLACEHOLDER, "Retailer", "Wholesaler", "Distributor", "Factory"]
 
 selected_mode = "BeerGameQualitative"
-system_prompt = MODEL_CONFIGS[selected_mode]["prompt"]
 
 STRUCTURED_RESPONSE_KEYS = [
     "quantitative_reasoning",
@@ -97,9 +122,13 @@ STRUCTURED_RESPONSE_KEYS = [
 if "start_time" not in st.session_state:
     st.session_state["start_time"] = datetime.now()
 
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+    sweep_stale_payloads()
+
 if "messages" not in st.session_state:
     st.session_state["messages"] = [
-        {"role": "assistant", "content": "Hello, I am your Beer Game coach."}
+        ChatTurn(ROLE_ASSISTANT, "Hello, I am your Beer Game coach.")
     ]
 
 if "selected_section" not in st.session_state:
@@ -203,9 +232,9 @@ def generate_assistant_payload(messages_to_send, system_text: str, mode_key: str
     response_input = [{"role": "system", "content": system_text}]
     response_input.append({"role": "system", "content": structured_output_instruction})
     response_input.extend(
-        {"role": msg["role"], "content": msg["content"]}
+        {"role": msg.role, "content": msg.content}
         for msg in messages_to_send
-        if msg["role"] in ("user", "assistant")
+        if msg.role in (ROLE_USER, ROLE_ASSISTANT)
     )
 
     try:
@@ -238,7 +267,13 @@ def save_conversation_to_gcp(messages_to_save, mode_key: str, pid: str, role: st
         start_time = st.session_state["start_time"]
         duration = end_time - start_time
 
-        chat_history_df = pd.DataFrame(messages_to_save)
+        chat_history_df = pd.DataFrame(
+            iter_turn_records(
+                messages_to_save,
+                st.session_state["session_id"],
+                load_structured_payload_from_gcp,
+            )
+        )
         metadata_rows = pd.DataFrame(
             [
                 {"role": "Mode", "content": mode_key},
@@ -271,6 +306,10 @@ def save_conversation_to_gcp(messages_to_save, mode_key: str, pid: str, role: st
         return None, str(exc)
 
 
+def load_structured_payload_from_gcp(file_name: str) -> dict:
+    return json.loads(bucket.blob(file_name).download_as_text())["assistant_output"]
+
+
 def save_structured_response_to_gcp(
     structured_payload: dict,
     mode_key: str,
@@ -278,6 +317,7 @@ def save_structured_response_to_gcp(
     role: str,
     section: str,
     user_input: str,
+    turn_number: int,
 ):
     if not pid or not role or not section or role == ROLE_PLACEHOLDER:
         return None, "missing_required_fields"
@@ -291,7 +331,8 @@ def save_structured_response_to_gcp(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         file_name = (
-            f"beergame_qualitative_structured_{safe_section}_P{safe_pid}_{safe_role}.json"
+            f"beergame_qualitative_structured_{safe_section}_P{safe_pid}_{safe_role}"
+            f"_{timestamp}_T{turn_number}.json"
         )
         local_path = os.path.join(created_files_path, file_name)
 
@@ -331,13 +372,14 @@ When you use the Beer Game Assistant, keep the following in mind:
 """
 )
 
-# Section
+# Section (locks with the role: it decides the game facts in the prompt)
 section_index = SECTION_OPTIONS.index(st.session_state["selected_section"]) if st.session_state["selected_section"] in SECTION_OPTIONS else 0
 st.sidebar.selectbox(
     "Section",
     SECTION_OPTIONS,
     index=section_index,
-    help="Select your class section.",
+    disabled=st.session_state["role_locked"],
+    help="Select your class section. Section will lock after your first message.",
     key="selected_section",
 )
 
@@ -366,7 +408,8 @@ st.sidebar.selectbox(
 current_role = st.session_state["selected_role"]
 if (not st.session_state["role_locked"]) and (current_role != st.session_state.get("welcome_role", "")):
     if current_role != ROLE_PLACEHOLDER:
-        st.session_state["messages"] = [{"role": "assistant", "content": build_welcome_message(current_role)}]
+        clear_payloads(st.session_state["session_id"])
+        st.session_state["messages"] = [ChatTurn(ROLE_ASSISTANT, build_welcome_message(current_role))]
         st.session_state["welcome_role"] = current_role
         st.session_state["start_time"] = datetime.now()
 
@@ -392,8 +435,8 @@ if st.sidebar.button("End Conversation"):
 # Render chat history
 # ----------------------------
 for message in st.session_state["messages"]:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+    with st.chat_message(message.role):
+        st.markdown(message.content)
 
 # ----------------------------
 # Require Section + PID + role before chatting
@@ -414,15 +457,19 @@ if not chat_enabled:
 # ----------------------------
 if user_input := st.chat_input("Ask a Beer Game question...", disabled=not chat_enabled):
     # Append user message
-    st.session_state["messages"].append({"role": "user", "content": user_input})
+    st.session_state["messages"].append(ChatTurn(ROLE_USER, user_input))
     with st.chat_message("user"):
         st.markdown(user_input)
 
-    # Lock role after first user message (now that they started chatting)
+    # Lock role and section after first user message (now that they started chatting)
     st.session_state["role_locked"] = True
 
     # Generate assistant response
     try:
+        system_prompt = build_mode_prompt(
+            MODEL_CONFIGS[selected_mode]["system_instruction"],
+            GAME_CONFIGS[st.session_state["selected_section"]],
+        )
         role_aware_prompt = build_system_prompt(system_prompt, st.session_state["selected_role"])
         assistant_payload = generate_assistant_payload(
             st.session_state["messages"],
@@ -437,12 +484,34 @@ if user_input := st.chat_input("Ask a Beer Game question...", disabled=not chat_
     with st.chat_message("assistant"):
         st.write_stream(response_generator(response=assistant_text))
 
+    # Autosave structured JSON (one file per turn; this is the durable copy
+    # of the full reasoning payload that the CSV is rebuilt from)
+    structured_file, structured_error = save_structured_response_to_gcp(
+        assistant_payload,
+        selected_mode,
+        st.session_state["pid"].strip(),
+        st.session_state["selected_role"].strip(),
+        st.session_state["selected_section"].strip(),
+        user_input,
+        len(st.session_state["messages"]),
+    )
+    if structured_error == "missing_required_fields":
+        st.sidebar.warning("Missing fields for structured JSON upload.")
+    elif structured_error:
+        st.sidebar.error(f"Structured JSON upload failed: {structured_error}")
+    else:
+        st.sidebar.caption(f"Structured JSON uploaded: {structured_file}")
+
+    # Keep only the rendered reply in session state; a local copy of the
+    # payload saves re-downloading it when the CSV is built.
+    payload_key = uuid.uuid4().hex
+    try:
+        payload_offset = spill_payload(st.session_state["session_id"], payload_key, assistant_payload)
+    except OSError as exc:
+        st.sidebar.warning(f"Could not cache reasoning for this reply locally: {exc}")
+        payload_key, payload_offset = None, NO_PAYLOAD
     st.session_state["messages"].append(
-        {
-            "role": "assistant",
-            "content": assistant_text,
-            "assistant_output": assistant_payload,
-        }
+        ChatTurn(ROLE_ASSISTANT, assistant_text, payload_key, payload_offset, structured_file)
     )
 
     # Autosave ALWAYS (CSV)
@@ -459,19 +528,3 @@ if user_input := st.chat_input("Ask a Beer Game question...", disabled=not chat_
         st.sidebar.error(f"Autosave failed: {save_error}")
     else:
         st.sidebar.caption(f"Autosaved: {saved_file}")
-
-    # Autosave structured JSON
-    structured_file, structured_error = save_structured_response_to_gcp(
-        assistant_payload,
-        selected_mode,
-        st.session_state["pid"].strip(),
-        st.session_state["selected_role"].strip(),
-        st.session_state["selected_section"].strip(),
-        user_input,
-    )
-    if structured_error == "missing_required_fields":
-        st.sidebar.warning("Missing fields for structured JSON upload.")
-    elif structured_error:
-        st.sidebar.error(f"Structured JSON upload failed: {structured_error}")
-    else:
-        st.sidebar.caption(f"Structured JSON uploaded: {structured_file}")
@@ -0,0 +1,86 @@
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    holding_cost: float = 0.5
+    backorder_cost: float = 1.0
+    shipping_delay: int = 2
+    factory_shipping_delay: int = 1
+    information_delay: int = 2
+    factory_information_delay: int = 1
+    starting_inventory: int = 12
+    horizon_weeks: Optional[int] = None
+
+    def validate(self) -> "GameConfig":
+        for name in ("holding_cost", "backorder_cost"):
+            cost = getattr(self, name)
+            if not math.isfinite(cost) or cost < 0:
+                raise ValueError(f"{name} must be a finite, non-negative number.")
+        for name in (
+            "shipping_delay",
+            "factory_shipping_delay",
+            "information_delay",
+            "factory_information_delay",
+        ):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must be non-negative.")
+        if self.starting_inventory < 0:
+            raise ValueError("starting_inventory must be non-negative.")
+        if self.horizon_weeks is not None and self.horizon_weeks <= 0:
+            raise ValueError("horizon_weeks must be positive when set.")
+        return self
+
+
+DEFAULT_GAME_CONFIG = GameConfig()
+
+# Sections listed here appear in the sidebar in this order; values override
+# DEFAULT_GAME_CONFIG field by field.
+SECTION_GAME_OVERRIDES = {
+    "OPMGT 301 A": {},
+    "OPMGT 301 B": {},
+    "OPMGT 301 C": {},
+}
+
+GAME_CONFIG_FIELDS = frozenset(f.name for f in fields(GameConfig))
+COST_FIELDS = ("holding_cost", "backorder_cost")
+
+
+def _coerce_field(name: str, value):
+    if name == "horizon_weeks" and value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number, got {value!r}.")
+    if name in COST_FIELDS:
+        return float(value)
+    if not math.isfinite(value) or int(value) != value:
+        raise ValueError(f"{name} must be a whole number of weeks or cases.")
+    return int(value)
+
+
+def build_game_config(overrides: Mapping, base: GameConfig = DEFAULT_GAME_CONFIG) -> GameConfig:
+    unknown = set(overrides) - GAME_CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown game config fields: {', '.join(sorted(unknown))}")
+
+    values = {name: _coerce_field(name, value) for name, value in overrides.items()}
+    return replace(base, **values).validate()
+
+
+def load_game_configs(section_overrides: Optional[Mapping] = None) -> dict:
+    """Build the section -> GameConfig registry, merging any deployment overrides."""
+    if section_overrides is not None and not isinstance(section_overrides, Mapping):
+        raise ValueError("game_configs must be a table of sections.")
+    merged = {section: dict(values) for section, values in SECTION_GAME_OVERRIDES.items()}
+    for section, values in (section_overrides or {}).items():
+        if not isinstance(values, Mapping):
+            raise ValueError(f"Overrides for section {section!r} must be a table of fields.")
+        merged.setdefault(section, {}).update(values)
+
+    if not merged:
+        raise ValueError("At least one section must be configured.")
+    return {section: build_game_config(values) for section, values in merged.items()}
+
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+# Interned so every turn in every session points at the same role string.
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+
+# Each assistant payload is persisted as its own structured JSON blob. A local
+# JSONL copy, one line per turn, avoids re-downloading those blobs on every
+# autosave; session state only holds what the chat window renders.
+PAYLOAD_SPILL_DIR = os.path.join(tempfile.gettempdir(), "beergame_turn_payloads")
+
+NO_PAYLOAD = -1
+
+# Local copies untouched for this long are removed. A live session whose copy
+# was swept still rebuilds its records from the persisted blobs.
+STALE_PAYLOAD_SECONDS = 6 * 60 * 60
+
+
+class ChatTurn:
+    __slots__ = ("role", "content", "payload_key", "payload_offset", "payload_blob")
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        payload_key: str = None,
+        payload_offset: int = NO_PAYLOAD,
+        payload_blob: str = None,
+    ):
+        self.role = sys.intern(role)
+        self.content = content
+        self.payload_key = payload_key
+        self.payload_offset = payload_offset
+        self.payload_blob = payload_blob
+
+    @property
+    def has_payload(self) -> bool:
+        return self.payload_key is not None or self.payload_blob is not None
+
+    def __repr__(self) -> str:
+        return (
+            f"ChatTurn(role={self.role!r}, content={self.content!r}, "
+            f"payload_key={self.payload_key!r}, payload_offset={self.payload_offset}, "
+            f"payload_blob={self.payload_blob!r})"
+        )
+
+
+def payload_spill_path(session_id: str) -> str:
+    return os.path.join(PAYLOAD_SPILL_DIR, f"{session_id}.jsonl")
+
+
+def spill_payload(session_id: str, payload_key: str, payload: dict) -> int:
+    os.makedirs(PAYLOAD_SPILL_DIR, exist_ok=True)
+    entry = {"key": payload_key, "payload": payload}
+    line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+    with open(payload_spill_path(session_id), "ab") as f:
+        offset = f.tell()
+        f.write(line)
+    return offset
+
+
+def clear_payloads(session_id: str) -> None:
+    try:
+        os.remove(payload_spill_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def sweep_stale_payloads(max_age_seconds: int = STALE_PAYLOAD_SECONDS) -> None:
+    cutoff = time.time() - max_age_seconds
+    try:
+        entries = list(os.scandir(PAYLOAD_SPILL_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _read_spilled_payload(spill_file, turn: ChatTurn):
+    # The key check catches a copy that was swept and restarted, which would
+    # otherwise hand back another turn's payload at the same offset.
+    if spill_file is None or turn.payload_key is None:
+        return None
+    try:
+        spill_file.seek(turn.payload_offset)
+        entry = json.loads(spill_file.readline())
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or entry.get("key") != turn.payload_key:
+        return None
+    return entry.get("payload")
+
+
+def iter_turn_records(turns, session_id: str, load_blob_payload=None):
+    """Yield the dict-per-message view used for the CSV export, one payload at a time.
+
+    Payloads come from the local copy when it is intact, otherwise from
+    ``load_blob_payload(blob_name)``; a payload neither can supply is None.
+    """
+    try:
+        spill_file = open(payload_spill_path(session_id), "rb")
+    except FileNotFoundError:
+        spill_file = None
+    try:
+        for turn in turns:
+            record = {"role": turn.role, "content": turn.content}
+            if turn.has_payload:
+                payload = _read_spilled_payload(spill_file, turn)
+                if payload is None and turn.payload_blob and load_blob_payload is not None:
+                    try:
+                        payload = load_blob_payload(turn.payload_blob)
+                    except Exception:
+                        payload = None
+                record["assistant_output"] = payload
+            yield record
+    finally:
+        if spill_file is not None:
+            spill_file.close()
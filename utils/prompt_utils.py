@@ -1,4 +1,9 @@
-COMMON_BEERGAME_CONTEXT = """
+from functools import lru_cache
+
+from utils.game_config import GameConfig
+
+
+BEERGAME_CONTEXT_HEADER = """
 You are a supply chain decision coach for the Beer Game. The supply chain includes four roles: factory, distributor, wholesaler, and retailer.
 The two types of flows in this supply chain include product and information.
 Shipment, i.e., product flow, is made downstream, i.e., from the factory to the distributor, then to the wholesaler, and finally to the retailer.
@@ -7,17 +12,36 @@ Order information is transmitted upstream in this supply chain, i.e., from the r
 TASK
 - Read the user’s message describing the current game state and give ordering guidance based on their role.
 - The objective for each supply chain role is to make decisions on how many units to order each week to minimize total costs.
+""".strip()
 
-GAME FACTS (course setting)
-- Holding cost: 0.5 per unit per week; Backorder cost: 1 per unit per week
-- Physical shipping delays: 2 weeks on all links, EXCEPT Plant/Brewery → Factory is 1 week
-- Information delays: 2 weeks on all links, EXCEPT Factory → Plant/Brewery is 1 week
-- Starting inventory: 12 cases for each role
-
+BEERGAME_CONTEXT_RULES = """
 RULES (always)
 - Do not suggest coordinating or messaging other roles.
 """.strip()
 
+
+def _format_weeks(weeks: int) -> str:
+    return f"{weeks} week" if weeks == 1 else f"{weeks} weeks"
+
+
+@lru_cache(maxsize=None)
+def build_beergame_context(game_config: GameConfig) -> str:
+    game_facts = [
+        "GAME FACTS (course setting)",
+        f"- Holding cost: {game_config.holding_cost:g} per unit per week; "
+        f"Backorder cost: {game_config.backorder_cost:g} per unit per week",
+        f"- Physical shipping delays: {_format_weeks(game_config.shipping_delay)} on all links, "
+        f"EXCEPT Plant/Brewery → Factory is {_format_weeks(game_config.factory_shipping_delay)}",
+        f"- Information delays: {_format_weeks(game_config.information_delay)} on all links, "
+        f"EXCEPT Factory → Plant/Brewery is {_format_weeks(game_config.factory_information_delay)}",
+        f"- Starting inventory: {game_config.starting_inventory} cases for each role",
+    ]
+    if game_config.horizon_weeks is not None:
+        game_facts.append(f"- Game length: {_format_weeks(game_config.horizon_weeks)}")
+
+    return "\n\n".join([BEERGAME_CONTEXT_HEADER, "\n".join(game_facts), BEERGAME_CONTEXT_RULES])
+
+
 QUALITATIVE_SYSTEM_INSTRUCTION = (
     "Prioritize plain-language coaching about the ordering direction and decision logic."
 )
@@ -26,15 +50,14 @@ QUANTITATIVE_SYSTEM_INSTRUCTION = (
     "Prioritize a concrete order recommendation grounded in explicit calculations."
 )
 
-qualitative_beergame_prompt = (
-    f"{COMMON_BEERGAME_CONTEXT}\n\n"
-    f"Mode emphasis: {QUALITATIVE_SYSTEM_INSTRUCTION}"
-)
 
-quantitative_beergame_prompt = (
-    f"{COMMON_BEERGAME_CONTEXT}\n\n"
-    f"Mode emphasis: {QUANTITATIVE_SYSTEM_INSTRUCTION}"
-)
+@lru_cache(maxsize=None)
+def build_mode_prompt(mode_instruction: str, game_config: GameConfig) -> str:
+    return (
+        f"{build_beergame_context(game_config)}\n\n"
+        f"Mode emphasis: {mode_instruction}"
+    )
+
 
 STRUCTURED_OUTPUT_COMMON_INSTRUCTION = (
     "Return ONLY valid JSON (no markdown, no extra text) with exactly these keys: "